@@ -6,8 +6,9 @@ import time
 import random
 import logging
 import os
-from datetime import datetime, timedelta
-from typing import List
+import sys
+from datetime import datetime
+from typing import BinaryIO
 import numpy as np
 from tqdm import tqdm
 
@@ -17,16 +18,20 @@ logging.disable(logging.CRITICAL)
 # Constantes otimizadas
 TOTAL_NAMES = 10_000_000  # 10 milhões de nomes
 BATCH_SIZE = 100_000     # Tamanho do lote para escrita em arquivo
-LOG_INTERVAL = 1_000_000 # Log a cada 1 milhão de nomes
-BUFFER_SIZE = 10_000     # Tamanho do buffer para escrita em arquivo
+BUFFER_SIZE = 1 << 20    # Buffer de 1 MB para escrita sequencial em arquivo
 
 # Carregar dados uma única vez
 FIRST_NAMES = []
 LAST_NAMES = []
+_FIRST_ARR = np.empty(0, dtype=bytes)
+_LAST_ARR = np.empty(0, dtype=bytes)
+
+# Gerador PCG64 (API nova do NumPy) em vez do RandomState legado
+_RNG = np.random.default_rng()
 
 def load_names():
     """Carrega os nomes uma única vez na memória."""
-    global FIRST_NAMES, LAST_NAMES
+    global FIRST_NAMES, LAST_NAMES, _FIRST_ARR, _LAST_ARR
     
     # Carrega nomes masculinos
     with open('rdmNames/data/dist.male.first', 'r', encoding='utf-8') as f:
@@ -42,20 +47,24 @@ def load_names():
     # Carrega sobrenomes
     with open('rdmNames/data/dist.all.last', 'r', encoding='utf-8') as f:
         LAST_NAMES = [line.split()[0].capitalize() for line in f]
+    
+    # Converte e codifica uma única vez para amostragem por índice
+    # (bytes UTF-8 de largura fixa, primeiros nomes já com o espaço)
+    _FIRST_ARR = np.char.encode(np.char.add(np.array(FIRST_NAMES, dtype=str), ' '), 'utf-8')
+    _LAST_ARR = np.char.encode(np.array(LAST_NAMES, dtype=str), 'utf-8')
 
 # Carregar dados ao importar
 load_names()
 
-def generate_name_batch(batch_size: int) -> List[str]:
-    """Gera um lote de nomes completos de forma otimizada."""
-    firsts = np.random.choice(FIRST_NAMES, size=batch_size)
-    lasts = np.random.choice(LAST_NAMES, size=batch_size)
-    return [f"{first} {last}" for first, last in zip(firsts, lasts)]
+def generate_name_batch(batch_size: int) -> np.ndarray:
+    """Gera um lote de nomes completos, já codificados em UTF-8."""
+    firsts = _FIRST_ARR[_RNG.integers(0, len(_FIRST_ARR), size=batch_size, dtype=np.int64)]
+    lasts = _LAST_ARR[_RNG.integers(0, len(_LAST_ARR), size=batch_size, dtype=np.int64)]
+    return np.char.add(firsts, lasts)
 
-def save_names_to_file(names: List[str], filename: str) -> None:
-    """Salva uma lista de nomes em um arquivo de forma otimizada."""
-    with open(filename, 'a', encoding='utf-8', buffering=BUFFER_SIZE) as f:
-        f.write('\n'.join(names) + '\n')
+def save_names_to_file(names: np.ndarray, f: BinaryIO) -> None:
+    """Salva um array de nomes codificados em um arquivo binário já aberto."""
+    f.write(b'\n'.join(names.tolist()) + b'\n')
 
 def generate_names(total: int, batch_size: int) -> None:
     """Gera nomes de forma otimizada."""
@@ -64,14 +73,14 @@ def generate_names(total: int, batch_size: int) -> None:
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_file = f'output/generated_names_{timestamp}.txt'
     
-    # Cria o arquivo vazio
-    open(output_file, 'w').close()
-    
     start_time = time.time()
     total_generated = 0
     
-    # Usando tqdm para barra de progresso
-    with tqdm(total=total, desc="Gerando nomes", unit="nomes") as pbar:
+    # Usando tqdm para barra de progresso (desativada fora de um terminal, já que
+    # ela mesma informa a taxa); o arquivo fica aberto durante toda a geração
+    with open(output_file, 'wb', buffering=BUFFER_SIZE) as f, \
+            tqdm(total=total, desc="Gerando nomes", unit="nomes",
+                 disable=not sys.stderr.isatty()) as pbar:
         remaining = total
         
         while remaining > 0:
@@ -79,22 +88,12 @@ def generate_names(total: int, batch_size: int) -> None:
             
             # Gera e salva o lote
             names = generate_name_batch(current_batch)
-            save_names_to_file(names, output_file)
+            save_names_to_file(names, f)
             
             # Atualiza contadores
             remaining -= current_batch
             total_generated += current_batch
             pbar.update(current_batch)
-            
-            # Log de progresso
-            if total_generated % LOG_INTERVAL == 0:
-                elapsed = time.time() - start_time
-                print(f"\nGerados {total_generated:,} nomes em {elapsed:.2f} segundos")
-                print(f"Velocidade: {total_generated/elapsed:,.0f} nomes/segundo")
-                
-                if total_generated > 0:
-                    remaining_time = (elapsed / total_generated) * (total - total_generated)
-                    print(f"Tempo estimado restante: {timedelta(seconds=int(remaining_time))}")
     
     # Relatório final
     elapsed = time.time() - start_time
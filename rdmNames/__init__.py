@@ -2,16 +2,20 @@
 rdmNames - Uma biblioteca otimizada para geração de nomes aleatórios.
 
 Esta versão inclui otimizações de desempenho como cache em memória,
-busca binária e suporte a concorrência.
+amostragem ponderada pelo método de alias e suporte a concorrência.
 """
 from __future__ import annotations
 import os
-import bisect
+import queue
 import random
 import threading
+import itertools
+import functools
+import tempfile
 import numpy as np
+from multiprocessing.pool import ThreadPool
 from os.path import abspath, join, dirname, exists
-from typing import Dict, List, Optional, Tuple, Union, TypeVar, Generic, Any, Generator
+from typing import Callable, List, Optional, Tuple, Union, TypeVar, Generic, Any, Generator
 
 __version__ = '1.0.0'
 __author__ = 'Seu Nome'
@@ -19,30 +23,10 @@ __license__ = 'MIT'
 
 # Type aliases
 T = TypeVar('T')
-NameData = List[Tuple[str, float]]
+NameData = Tuple[np.ndarray, np.ndarray]  # (nomes, distribuição acumulada normalizada)
 
-# Cache global thread-safe
-class _NameCache:
-    _instance = None
-    _lock = threading.RLock()
-    
-    def __new__(cls):
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = super().__new__(cls)
-                cls._instance._cache: Dict[str, NameData] = {}
-            return cls._instance
-    
-    def get(self, filename: str) -> Optional[NameData]:
-        with self._lock:
-            return self._cache.get(filename)
-    
-    def set(self, filename: str, data: NameData) -> None:
-        with self._lock:
-            self._cache[filename] = data
-
-# Inicialização do cache
-_name_cache = _NameCache()
+# Gerador PCG64 compartilhado para a geração em lote
+_RNG = np.random.default_rng()
 
 def _get_full_path(filename: str) -> str:
     """Retorna o caminho absoluto para um arquivo de dados."""
@@ -55,102 +39,252 @@ FILES = {
     'last': _get_full_path('dist.all.last'),
 }
 
-def _load_names(filename: str) -> NameData:
-    """Carrega e armazena em cache os nomes do arquivo."""
-    # Verifica se já está em cache
-    if cached := _name_cache.get(filename):
-        return cached
+def _parse_names(filename: str) -> NameData:
+    """Lê o arquivo texto e retorna nomes capitalizados e a distribuição acumulada, ordenados."""
+    name_list: List[str] = []
+    cum_list: List[float] = []
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            parts = line.strip().split()
+            if len(parts) >= 3:
+                name_list.append(parts[0])
+                cum_list.append(float(parts[2]))
+    
+    names_arr = np.char.capitalize(np.array(name_list, dtype=str))
+    cum_arr = np.array(cum_list, dtype=np.float64)
     
-    # Carrega do arquivo se não estiver em cache
-    names: NameData = []
+    # Ordena por probabilidade acumulada (ordenação estável em C)
+    order = np.argsort(cum_arr, kind='stable')
+    names_arr = names_arr[order]
+    cum_arr = cum_arr[order]
+    
+    # Normaliza a distribuição acumulada para terminar em 1.0
+    if len(cum_arr):
+        cum_arr /= cum_arr[-1]
+    return names_arr, cum_arr
+
+def _remove_quietly(path: str) -> None:
+    """Remove um arquivo, ignorando erros."""
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            for line in f:
-                parts = line.strip().split()
-                if len(parts) >= 3:
-                    name = parts[0]
-                    cummulative = float(parts[2])
-                    names.append((name, cummulative))
-        
-        # Ordena por probabilidade acumulada para busca binária
-        names.sort(key=lambda x: x[1])
+        os.unlink(path)
+    except OSError:
+        pass
+
+def _save_cache(cache_file: str, data: np.ndarray) -> None:
+    """Grava um cache .npy de forma atômica, ignorando falhas de E/S."""
+    # Grava em um arquivo temporário e o troca de forma atômica, para que
+    # nenhum processo veja um cache parcial
+    try:
+        fd, tmp_file = tempfile.mkstemp(
+            prefix=os.path.basename(cache_file) + '.', suffix='.tmp', dir=dirname(cache_file),
+        )
+    except OSError:
+        return  # Diretório somente leitura: segue sem cache
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, data)
+        os.chmod(tmp_file, 0o644)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        _remove_quietly(tmp_file)  # Disco cheio ou sem permissão: segue sem cache
+    except BaseException:
+        _remove_quietly(tmp_file)
+        raise
+
+def _load_cached(cache_files: List[str], source_files: List[str],
+                 build: Callable[[], Tuple[np.ndarray, ...]]) -> Tuple[np.ndarray, ...]:
+    """
+    Mapeia em memória caches .npy atualizados ou os reconstrói juntos com `build`.
+    
+    Args:
+        cache_files: Caminhos dos caches, na ordem dos arrays retornados por `build`
+        source_files: Arquivos de origem; caches mais antigos que eles são refeitos
+        build: Função que constrói todos os arrays de uma só vez
         
-        # Armazena no cache
-        _name_cache.set(filename, names)
-        return names
+    Returns:
+        Tupla com um array por arquivo de cache
+    """
+    newest_source = max(os.path.getmtime(source) for source in source_files)
+    if all(exists(cache_file) and os.path.getmtime(cache_file) >= newest_source
+           for cache_file in cache_files):
+        try:
+            return tuple(np.load(cache_file, mmap_mode='r') for cache_file in cache_files)
+        except (OSError, ValueError, EOFError):
+            pass  # Cache truncado ou corrompido: reconstrói abaixo
+    
+    arrays = build()
+    for cache_file, data in zip(cache_files, arrays):
+        _save_cache(cache_file, data)
+    return arrays
+
+@functools.lru_cache(maxsize=None)
+def _load_names(filename: str) -> NameData:
+    """Carrega os nomes do arquivo e sua distribuição acumulada de caches .npy em disco."""
+    try:
+        names, cum = _load_cached(
+            [f"{filename}.text.npy", f"{filename}.cdf.npy"], [filename], lambda: _parse_names(filename),
+        )
+        return names, cum
     except Exception as e:
         raise RuntimeError(f"Falha ao carregar o arquivo {filename}: {str(e)}")
 
-def _get_random_name(names: NameData) -> str:
-    """Obtém um nome aleatório usando busca binária."""
-    if not names:
-        return ""
-    
-    # Gera um valor aleatório e usa busca binária para encontrar o nome
-    target = random.random() * 90
+@functools.lru_cache(maxsize=None)
+def _alias_table(filename: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Constrói as tabelas do método de alias de Walker (Vose) para um arquivo."""
+    _, cumulatives = _load_names(filename)
+    n = len(cumulatives)
+    scaled = (np.diff(cumulatives, prepend=0.0) * n).tolist()
+    prob = [1.0] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
     
-    # Extrai apenas os valores acumulados para busca binária
-    cumulatives = [c for _, c in names]
+    # Cada coluna recebe a sobra de um nome com peso acima da média
+    while small and large:
+        s = small.pop()
+        g = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = g
+        scaled[g] += scaled[s] - 1.0
+        (small if scaled[g] < 1.0 else large).append(g)
     
-    # Encontra o índice usando busca binária
-    idx = bisect.bisect_right(cumulatives, target)
+    return np.array(prob, dtype=np.float64), np.array(alias, dtype=np.int64)
+
+def _get_random_name(filename: str) -> str:
+    """Obtém um nome aleatório ponderado em O(1) pelo método de alias."""
+    names, _ = _load_names(filename)
+    if not len(names):
+        return ""
     
-    # Retorna o nome correspondente, ou o último se o índice for maior que o tamanho
-    return names[min(idx, len(names) - 1)][0]
+    prob, alias = _alias_table(filename)
+    i = random.randrange(len(names))
+    return str(names[i] if random.random() < prob[i] else names[alias[i]])
 
 def get_first_name(gender: Optional[str] = None) -> str:
     """Retorna um primeiro nome aleatório."""
     if gender not in ('male', 'female'):
         gender = random.choice(('male', 'female'))
     
-    filename = FILES[f'first:{gender}']
-    names = _load_names(filename)
-    return _get_random_name(names).capitalize()
+    return _get_random_name(FILES[f'first:{gender}'])
 
 def get_last_name() -> str:
     """Retorna um sobrenome aleatório."""
-    filename = FILES['last']
-    names = _load_names(filename)
-    return _get_random_name(names).capitalize()
+    return _get_random_name(FILES['last'])
 
 def get_full_name(gender: Optional[str] = None) -> str:
     """Retorna um nome completo aleatório."""
     return f"{get_first_name(gender)} {get_last_name()}"
 
-# Otimização: Pré-carrega os dados na primeira importação
-# Isso garante que o carregamento ocorra apenas uma vez
-_ = _load_names(FILES['last'])
-_ = _load_names(FILES['first:male'])
-_ = _load_names(FILES['first:female'])
+def _get_random_names(filename: str, n: int) -> np.ndarray:
+    """Obtém `n` nomes aleatórios ponderados, vetorizando o método de alias."""
+    names, _ = _load_names(filename)
+    prob, alias = _alias_table(filename)
+    i = _RNG.integers(0, len(names), size=n)
+    return names[np.where(_RNG.random(n) < prob[i], i, alias[i])]
 
-# Carrega todos os nomes em listas para acesso rápido
-FIRST_NAMES = []
-LAST_NAMES = []
+def get_first_name_batch(n: int, gender: Optional[str] = None) -> List[str]:
+    """
+    Retorna `n` primeiros nomes aleatórios, ponderados pela frequência.
+    
+    Args:
+        n: Número de nomes a serem gerados
+        gender: 'male', 'female' ou None para misturar ambos
+        
+    Returns:
+        Lista com os primeiros nomes sorteados
+    """
+    if gender in ('male', 'female'):
+        return _get_random_names(FILES[f'first:{gender}'], n).tolist()
+    
+    # Sorteia quantos nomes vêm de cada gênero e amostra só esses
+    n_male = int(_RNG.binomial(n, 0.5))
+    names = np.concatenate([
+        _get_random_names(FILES['first:male'], n_male),
+        _get_random_names(FILES['first:female'], n - n_male),
+    ])
+    _RNG.shuffle(names)
+    return names.tolist()
 
-def _load_all_names() -> None:
-    """Carrega todos os nomes em listas para acesso rápido."""
-    global FIRST_NAMES, LAST_NAMES
+def get_last_name_batch(n: int) -> List[str]:
+    """
+    Retorna `n` sobrenomes aleatórios, ponderados pela frequência.
     
-    # Carrega nomes masculinos
-    male_names = []
-    with open(FILES['first:male'], 'r', encoding='utf-8') as f:
-        male_names = [line.split()[0].capitalize() for line in f]
+    Args:
+        n: Número de sobrenomes a serem gerados
+        
+    Returns:
+        Lista com os sobrenomes sorteados
+    """
+    return _get_random_names(FILES['last'], n).tolist()
+
+# Arrays NumPy de largura fixa para amostragem por índice: primeiros nomes
+# já seguidos de espaço, para uma única junção por lote, e sobrenomes
+_FIRST_SP = np.empty(0, dtype=str)
+_LAST_U = np.empty(0, dtype=str)
+
+# Buffers contíguos com todos os "Primeiro " e todos os "Último\n", com os
+# deslocamentos de cada nome; montar um lote vira apenas cópia de fatias
+_FIRST_BLOB = np.empty(0, dtype=np.uint8)
+_FIRST_OFF = np.zeros(1, dtype=np.int64)
+_LAST_BLOB = np.empty(0, dtype=np.uint8)
+_LAST_OFF = np.zeros(1, dtype=np.int64)
+
+# Arquivos de origem dos primeiros nomes e dos sobrenomes
+_FIRST_SOURCES = [FILES['first:male'], FILES['first:female']]
+_LAST_SOURCES = [FILES['last']]
+
+def _concat_names(sources: List[str]) -> np.ndarray:
+    """Concatena os nomes carregados de cada arquivo de origem."""
+    return np.concatenate([_load_names(source)[0] for source in sources])
+
+def _pack_blob(names: np.ndarray, suffix: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatena os nomes, cada um seguido de `suffix`, e retorna o buffer e os deslocamentos."""
+    fixed = np.char.encode(np.char.add(names, suffix), 'utf-8')
+    lens = np.char.str_len(fixed)
+    offsets = np.zeros(len(fixed) + 1, dtype=np.int64)
+    np.cumsum(lens, out=offsets[1:])
     
-    # Carrega nomes femininos
-    female_names = []
-    with open(FILES['first:female'], 'r', encoding='utf-8') as f:
-        female_names = [line.split()[0].capitalize() for line in f]
+    # Na matriz (n_nomes, largura) em ordem C, os bytes válidos de cada linha
+    # já estão na ordem do buffer final
+    matrix = fixed.view(np.uint8).reshape(len(fixed), fixed.itemsize)
+    return matrix[np.arange(fixed.itemsize) < lens[:, None]], offsets
+
+def _load_all_names() -> None:
+    """Mapeia em memória os arrays da geração em lote, sem copiá-los para o heap."""
+    global _FIRST_SP, _LAST_U, _FIRST_BLOB, _FIRST_OFF, _LAST_BLOB, _LAST_OFF
     
-    # Carrega sobrenomes
-    with open(FILES['last'], 'r', encoding='utf-8') as f:
-        LAST_NAMES = [line.split()[0].capitalize() for line in f]
+    # Os caches ficam no diretório de dados; o sistema operacional os pagina
+    # e compartilha entre processos
+    (_FIRST_SP,) = _load_cached(
+        [_get_full_path('first.text.npy')], _FIRST_SOURCES,
+        lambda: (np.char.add(_concat_names(_FIRST_SOURCES), ' '),),
+    )
+    _LAST_U = _load_names(FILES['last'])[0]
     
-    # Combina nomes masculinos e femininos
-    FIRST_NAMES = male_names + female_names
+    _FIRST_BLOB, _FIRST_OFF = _load_cached(
+        [_get_full_path('first.blob.npy'), _get_full_path('first.off.npy')], _FIRST_SOURCES,
+        lambda: _pack_blob(_concat_names(_FIRST_SOURCES), ' '),
+    )
+    _LAST_BLOB, _LAST_OFF = _load_cached(
+        [_get_full_path('last.blob.npy'), _get_full_path('last.off.npy')], _LAST_SOURCES,
+        lambda: _pack_blob(_LAST_U, '\n'),
+    )
 
-# Carrega todos os nomes na inicialização
+# Mapeia os arrays na inicialização; as listas FIRST_NAMES e LAST_NAMES só
+# são montadas se acessadas (veja __getattr__)
 _load_all_names()
 
+def __getattr__(name: str) -> Any:
+    """Monta FIRST_NAMES e LAST_NAMES sob demanda, mantendo a API de listas."""
+    if name == 'FIRST_NAMES':
+        value = _concat_names(_FIRST_SOURCES).tolist()
+    elif name == 'LAST_NAMES':
+        value = _LAST_U.tolist()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
 def generate_names_batch(batch_size: int = 100_000) -> List[str]:
     """
     Gera um lote de nomes completos de forma otimizada.
@@ -161,9 +295,47 @@ def generate_names_batch(batch_size: int = 100_000) -> List[str]:
     Returns:
         Lista de strings no formato "PrimeiroNome Sobrenome"
     """
-    firsts = np.random.choice(FIRST_NAMES, size=batch_size)
-    lasts = np.random.choice(LAST_NAMES, size=batch_size)
-    return [f"{first} {last}" for first, last in zip(firsts, lasts)]
+    fi = _RNG.integers(0, len(_FIRST_SP), size=batch_size, dtype=np.int64)
+    li = _RNG.integers(0, len(_LAST_U), size=batch_size, dtype=np.int64)
+    # Junção vetorizada em C sobre buffers de largura fixa, sem laço Python
+    out = np.char.add(_FIRST_SP[fi], _LAST_U[li])
+    return out.tolist()
+
+@functools.lru_cache(maxsize=None)
+def _numba_fill_batch() -> Optional[Callable[..., None]]:
+    """Importa o kernel Numba na primeira chamada; None se o Numba não estiver instalado."""
+    try:
+        from ._kernels import fill_batch
+    except ImportError:  # Numba é opcional; sem ele usa-se o caminho em Python/NumPy
+        return None
+    return fill_batch
+
+def _segment_indices(starts: np.ndarray, lens: np.ndarray) -> np.ndarray:
+    """Concatena os intervalos [starts[k], starts[k] + lens[k]) em um único array de índices."""
+    ends = np.cumsum(lens)
+    return np.repeat(starts - (ends - lens), lens) + np.arange(ends[-1] if len(ends) else 0)
+
+def _generate_batch_bytes(batch_size: int, rng: np.random.Generator,
+                          fill_batch: Optional[Callable[..., None]] = None) -> List[Any]:
+    """Gera um lote de nomes já codificados, como pedaços a serem gravados em sequência."""
+    fi = rng.integers(0, len(_FIRST_OFF) - 1, size=batch_size, dtype=np.int64)
+    li = rng.integers(0, len(_LAST_OFF) - 1, size=batch_size, dtype=np.int64)
+    
+    first_lens = _FIRST_OFF[fi + 1] - _FIRST_OFF[fi]
+    last_lens = _LAST_OFF[li + 1] - _LAST_OFF[li]
+    ends = np.cumsum(first_lens + last_lens)
+    out = np.empty(int(ends[-1]) if batch_size else 0, dtype=np.uint8)
+    
+    if fill_batch is not None:
+        # Kernel fundido: monta os bytes finais direto em um único buffer
+        fill_batch(out, ends, fi, li, _FIRST_BLOB, _FIRST_OFF, _LAST_BLOB, _LAST_OFF)
+        return [out]
+    
+    # Sem Numba: as mesmas cópias de fatias, vetorizadas com índices em NumPy
+    starts = ends - first_lens - last_lens
+    out[_segment_indices(starts, first_lens)] = _FIRST_BLOB[_segment_indices(_FIRST_OFF[fi], first_lens)]
+    out[_segment_indices(starts + first_lens, last_lens)] = _LAST_BLOB[_segment_indices(_LAST_OFF[li], last_lens)]
+    return [out]
 
 def generate_names(total: int, batch_size: int = 100_000) -> Generator[List[str], None, None]:
     """
@@ -182,6 +354,55 @@ def generate_names(total: int, batch_size: int = 100_000) -> Generator[List[str]
         yield generate_names_batch(current_batch)
         remaining -= current_batch
 
+def _write_all(fd: int, data: bytes) -> None:
+    """Grava todos os bytes no descritor, repetindo em escritas parciais."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+# os.writev não existe no Windows; lá os fragmentos são unidos antes da escrita
+_HAS_WRITEV = hasattr(os, 'writev')
+
+def _iov_max() -> int:
+    """Retorna o limite de iovecs por chamada de os.writev."""
+    try:
+        limit = os.sysconf('SC_IOV_MAX')
+    except (AttributeError, ValueError, OSError):
+        limit = -1
+    return limit if limit > 0 else 16  # 16 é o mínimo garantido pelo POSIX
+
+_IOV_MAX = _iov_max() if _HAS_WRITEV else 0
+
+def _writev_all(fd: int, pieces: List[Any]) -> None:
+    """Grava os pedaços em sequência com os.writev, completando escritas parciais."""
+    written = os.writev(fd, pieces[:_IOV_MAX])
+    
+    # Escrita parcial ou pedaços além do limite de iovecs: grava o restante
+    for piece in pieces:
+        size = memoryview(piece).nbytes
+        if written >= size:
+            written -= size
+            continue
+        _write_all(fd, memoryview(piece)[written:])
+        written = 0
+
+def _write_batches(fd: int, batches: queue.Queue, errors: List[BaseException]) -> None:
+    """Consome os lotes codificados da fila e os grava no arquivo."""
+    while (shards := batches.get()) is not None:
+        if errors:
+            continue  # Apenas esvazia a fila para não travar o produtor
+        try:
+            pieces = list(itertools.chain.from_iterable(shards))
+            if len(pieces) == 1:
+                _write_all(fd, pieces[0])
+            elif _HAS_WRITEV:
+                # Um buffer contíguo por fragmento: poucas iovecs, sem cópia extra
+                _writev_all(fd, pieces)
+            else:
+                _write_all(fd, b''.join(pieces))
+        except BaseException as e:
+            errors.append(e)
+
 def generate_names_to_file(total: int, output_file: str, batch_size: int = 100_000) -> None:
     """
     Gera nomes e salva em um arquivo de forma otimizada.
@@ -196,11 +417,52 @@ def generate_names_to_file(total: int, output_file: str, batch_size: int = 100_0
     if output_dir and not exists(output_dir):
         os.makedirs(output_dir, exist_ok=True)
     
-    # Cria o arquivo vazio
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('')  # Cria o arquivo vazio
+    # O kernel paralelo do Numba só é usado na thread principal: iniciado a
+    # partir de outra thread, o runtime dele trava o encerramento do interpretador
+    fill_batch = None
+    if threading.current_thread() is threading.main_thread():
+        fill_batch = _numba_fill_batch()
     
-    # Gera e salva em lotes
-    for batch in generate_names(total, batch_size):
-        with open(output_file, 'a', encoding='utf-8') as f:
-            f.write('\n'.join(batch) + '\n')
+    # Um gerador independente por thread evita disputa pelo estado global.
+    # Com Numba o kernel já é paralelo, então basta um único fragmento.
+    n_workers = 1 if fill_batch is not None else (os.cpu_count() or 1)
+    rngs = [np.random.default_rng(seed) for seed in np.random.SeedSequence().spawn(n_workers)]
+    
+    # Gera e salva em lotes, mantendo o descritor aberto durante toda a geração.
+    # A escrita roda em outra thread para sobrepor CPU e E/S; a fila
+    # limitada mantém no máximo dois lotes em memória. A geração fica na
+    # thread que chamou, onde o kernel paralelo do Numba pode ser chamado.
+    batches: queue.Queue = queue.Queue(maxsize=2)
+    errors: List[BaseException] = []
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(output_file, flags, 0o666)
+    pool: Optional[ThreadPool] = None
+    try:
+        # O pool só é necessário quando o lote é dividido entre várias threads
+        if n_workers > 1:
+            pool = ThreadPool(n_workers)
+        writer = threading.Thread(target=_write_batches, args=(fd, batches, errors), daemon=True)
+        writer.start()
+        try:
+            remaining = total
+            while remaining > 0 and not errors:
+                current_batch = min(batch_size, remaining)
+                
+                if pool is None:
+                    shards = [_generate_batch_bytes(current_batch, rngs[0], fill_batch)]
+                else:
+                    # Divide o lote em fragmentos gerados em paralelo
+                    shard_size, extra = divmod(current_batch, n_workers)
+                    sizes = [shard_size + (i < extra) for i in range(n_workers)]
+                    shards = pool.starmap(_generate_batch_bytes, zip(sizes, rngs))
+                batches.put(shards)
+                remaining -= current_batch
+        finally:
+            batches.put(None)
+            writer.join()
+    finally:
+        if pool is not None:
+            pool.terminate()
+        os.close(fd)
+    if errors:
+        raise errors[0]
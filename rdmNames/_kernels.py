@@ -0,0 +1,21 @@
+"""
+Kernels Numba do rdmNames.
+
+Importado sob demanda por rdmNames._numba_fill_batch, para que o Numba
+(dependência opcional) não pese na importação do pacote.
+"""
+import numba
+
+
+@numba.njit(parallel=True, nogil=True, cache=True)
+def fill_batch(out, ends, fi, li, first_blob, first_off, last_blob, last_off):
+    """Copia "Primeiro " e "Último\n" de cada linha para sua posição em `out`."""
+    for i in numba.prange(fi.shape[0]):
+        a0 = first_off[fi[i]]
+        a1 = first_off[fi[i] + 1]
+        b0 = last_off[li[i]]
+        b1 = last_off[li[i] + 1]
+        p = ends[i] - (a1 - a0) - (b1 - b0)
+        out[p:p + (a1 - a0)] = first_blob[a0:a1]
+        p += a1 - a0
+        out[p:p + (b1 - b0)] = last_blob[b0:b1]
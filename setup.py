@@ -9,6 +9,9 @@ setup(
     },
     python_requires='>=3.7',
     install_requires=[],
+    extras_require={
+        'fast': ['numba'],
+    },
     author="Seu Nome",
     author_email="seu.email@example.com",
     description="Uma biblioteca otimizada para geração de nomes aleatórios",
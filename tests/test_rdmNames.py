@@ -0,0 +1,102 @@
+import collections
+import os
+import re
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import rdmNames
+
+
+class AliasTableTest(unittest.TestCase):
+    def test_reconstructs_distribution(self):
+        """As tabelas de alias devem reproduzir os pesos da distribuição acumulada."""
+        for filename in rdmNames.FILES.values():
+            _, cumulatives = rdmNames._load_names(filename)
+            prob, alias = rdmNames._alias_table(filename)
+            n = len(cumulatives)
+            
+            # Cada coluna i devolve i com prob[i] e alias[i] com o restante
+            weights = prob.copy()
+            np.add.at(weights, alias, 1.0 - prob)
+            np.testing.assert_allclose(weights / n, np.diff(cumulatives, prepend=0.0), atol=1e-9)
+            self.assertTrue(np.all((prob >= 0.0) & (prob <= 1.0 + 1e-9)))
+
+
+
+class FirstNameBatchTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(rdmNames, '_RNG', np.random.default_rng(12345))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_length(self):
+        for gender in ('male', 'female', None):
+            for n in (0, 1, 1_000):
+                self.assertEqual(len(rdmNames.get_first_name_batch(n, gender)), n)
+    
+    def test_gender_restriction(self):
+        male = set(rdmNames._load_names(rdmNames.FILES['first:male'])[0].tolist())
+        female = set(rdmNames._load_names(rdmNames.FILES['first:female'])[0].tolist())
+        self.assertLessEqual(set(rdmNames.get_first_name_batch(5_000, 'male')), male)
+        self.assertLessEqual(set(rdmNames.get_first_name_batch(5_000, 'female')), female)
+        self.assertLessEqual(set(rdmNames.get_first_name_batch(5_000)), male | female)
+    
+    def test_frequency_matches_distribution(self):
+        """A frequência observada de cada nome deve seguir os pesos da distribuição."""
+        n = 200_000
+        names, cumulatives = rdmNames._load_names(rdmNames.FILES['first:female'])
+        expected = np.diff(cumulatives, prepend=0.0)
+        
+        counts = collections.Counter(rdmNames.get_first_name_batch(n, 'female'))
+        observed = np.array([counts[name] for name in names.tolist()]) / n
+        
+        # Tolerância de cinco desvios-padrão da binomial para cada nome
+        tolerance = 5 * np.sqrt(expected * (1 - expected) / n) + 1e-6
+        self.assertTrue(np.all(np.abs(observed - expected) <= tolerance))
+
+
+class GenerateNamesToFileTest(unittest.TestCase):
+    # Uma linha por nome: "Primeiro Último"
+    LINE_RE = re.compile(r'[A-Z][a-z]* [A-Z][a-z]*')
+    
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.output_file = os.path.join(tmp_dir.name, 'names.txt')
+    
+    def _check_output(self, total, batch_size):
+        rdmNames.generate_names_to_file(total, self.output_file, batch_size=batch_size)
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        lines = content.split('\n')
+        self.assertEqual(lines.pop(), '')
+        self.assertEqual(len(lines), total)
+        for line in lines:
+            self.assertIsNotNone(self.LINE_RE.fullmatch(line), line)
+    
+    def test_sharded_without_numba(self):
+        """Com várias CPUs o lote é dividido em fragmentos, inclusive vazios."""
+        with mock.patch.object(rdmNames, '_numba_fill_batch', return_value=None), \
+                mock.patch.object(rdmNames.os, 'cpu_count', return_value=4):
+            for total, batch_size in [(0, 10), (2, 10), (3, 10), (10_007, 1_000)]:
+                self._check_output(total, batch_size)
+    
+    def test_single_worker_without_numba(self):
+        with mock.patch.object(rdmNames, '_numba_fill_batch', return_value=None), \
+                mock.patch.object(rdmNames.os, 'cpu_count', return_value=1):
+            for total, batch_size in [(0, 10), (3, 10), (10_007, 1_000)]:
+                self._check_output(total, batch_size)
+    
+    def test_with_numba(self):
+        if rdmNames._numba_fill_batch() is None:
+            self.skipTest("Numba não está instalado")
+        for total, batch_size in [(0, 10), (3, 10), (10_007, 1_000)]:
+            self._check_output(total, batch_size)
+
+
+if __name__ == '__main__':
+    unittest.main()